@@ -0,0 +1,106 @@
+# Справочные данные и расчёты для калькулятора печи Муссон (без UI).
+import math
+from collections import namedtuple
+
+import numpy as np
+import streamlit as st
+
+def _table(values, dtype=None):
+    # Таблицы создаются один раз на процесс при импорте и общие для всех
+    # сессий Streamlit, поэтому запрещаем их изменение.
+    arr = np.array(values, dtype=dtype)
+    arr.flags.writeable = False
+    return arr
+
+# --- Параметры материалов ---
+MATERIALS = {
+    "кирпич": 0.81,
+    "газоблок": 0.12,
+    "дерево": 0.18,
+    "сэндвич-панель": 0.04,
+    "керамзит блок": 0.43,
+    "пенобетон": 0.14
+}
+
+MATERIAL_NAMES = tuple(MATERIALS)
+MATERIAL_LAMBDA = _table([MATERIALS[m] for m in MATERIAL_NAMES])
+
+# --- Модели "Муссон" ---
+Model = namedtuple("Model", "name volume_l price")
+
+MUSSON_MODELS = (
+    Model("Муссон 300", 77, 45000),
+    Model("Муссон 600", 125, 65000),
+    Model("Муссон 1000", 200, 85000),
+    Model("Муссон 1500", 311, 110000),
+    Model("Муссон 2000", 467, 135000),
+)
+
+MODEL_NAMES = tuple(m.name for m in MUSSON_MODELS)
+MODEL_VOLUME_L = _table([m.volume_l for m in MUSSON_MODELS], dtype=float)
+MODEL_PRICES = _table([m.price for m in MUSSON_MODELS])
+MODEL_ORDER = _table(np.argsort(MODEL_PRICES, kind="stable"))  # по возрастанию цены
+
+# --- Плотность и теплотворная способность топлива ---
+WOOD_TYPES = {
+    "хвойные": {"density": 350, "q": 17, "price_per_ton": 2500},
+    "берёза": {"density": 450, "q": 18, "price_per_ton": 3500},
+    "дуб": {"density": 550, "q": 19.5, "price_per_ton": 5000},
+    "плита (ЛДСП/ДСП/фанера/OSB/мебельные отходы)": {"density": 600, "q": 17.5, "price_per_ton": 2000}
+}
+
+# Поля топлива параллельными массивами: один индекс из selectbox вместо
+# WOOD_TYPES[name]["..."] на каждое поле.
+WOOD_NAMES = tuple(WOOD_TYPES)
+WOOD_DENSITY = _table([WOOD_TYPES[w]["density"] for w in WOOD_NAMES], dtype=float)
+WOOD_Q = _table([WOOD_TYPES[w]["q"] for w in WOOD_NAMES], dtype=float)
+WOOD_PRICE = _table([WOOD_TYPES[w]["price_per_ton"] for w in WOOD_NAMES], dtype=float)
+
+@st.cache_data(max_entries=64)
+def _geometry(area_m2, height_m, wall_thickness_m, material_idx,
+              windows_m2, doors_m2, roof_insulation):
+    # Всё, что не зависит от температур: считается один раз на набор
+    # размеров здания, ползунки температур сюда не попадают.
+    # Теплопотери линейны по (t_in - t_out), поэтому все ограждения
+    # сворачиваются в одну суммарную теплопередачу, Вт/°C.
+    volume_m3 = area_m2 * height_m
+    lambda_wall = MATERIAL_LAMBDA[material_idx]
+    r_wall = wall_thickness_m / lambda_wall
+    wall_area = 2 * height_m * (math.sqrt(area_m2) * 4) - windows_m2 - doors_m2
+    roof_r = 0.2 if not roof_insulation else 1.0
+    ua_walls = wall_area / r_wall
+    ua_windows = windows_m2 / 0.4
+    ua_doors = doors_m2 / 0.6
+    ua_roof = area_m2 / roof_r
+    ua_vent = 0.3 * volume_m3
+    return float(ua_walls + ua_windows + ua_doors + ua_roof + ua_vent)
+
+def _apply_temp(ua_w_per_c, t_in, t_out):
+    # t_out может быть массивом NumPy — тогда это готовый расчёт по сетке температур.
+    return ua_w_per_c * (t_in - t_out) / 1000  # кВт
+
+def calc_heat_loss(area_m2, height_m, wall_thickness_m, material_idx, t_in, t_out, 
+                   windows_m2=0, doors_m2=0, roof_insulation=True):
+    ua_w_per_c = _geometry(area_m2, height_m, wall_thickness_m, material_idx,
+                           windows_m2, doors_m2, roof_insulation)
+    return _apply_temp(ua_w_per_c, t_in, t_out)
+
+def _kwh_per_l(wood_idx, fill_fraction, efficiency):
+    # Полезная энергия с литра топки: от модели не зависит, считается один раз.
+    return fill_fraction * WOOD_DENSITY[wood_idx] * WOOD_Q[wood_idx] / 3600 * efficiency
+
+def musson_power(volume_l, fill_fraction, wood_idx, efficiency, burn_hours):
+    m_wood = volume_l * (fill_fraction * WOOD_DENSITY[wood_idx] / 1000)
+    useful_kwh = volume_l * _kwh_per_l(wood_idx, fill_fraction, efficiency)
+    p_kw = useful_kwh / burn_hours
+    return useful_kwh, p_kw, m_wood
+
+def best_model(p_kw, required_kw):
+    # Первая достаточно мощная модель в порядке цены и есть самая дешёвая.
+    for i in MODEL_ORDER:
+        if p_kw[i] >= required_kw:
+            return int(i)
+    return None
+
+def calculate_fuel_consumption(daily_heat_loss_kwh, wood_energy_kwh_per_kg):
+    return daily_heat_loss_kwh / wood_energy_kwh_per_kg